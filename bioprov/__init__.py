@@ -10,8 +10,10 @@ Inherits objects from the src/ package.
 """
 
 
-from .src.config import config, Environment, BioProvDB, Config
-from .src.files import File, SeqFile, Directory
+import sys
+
+from .src.config import get_config, Environment, BioProvDB, Config
+from .src.files import File, SeqFile, Directory, FileTable
 from .src.main import (
     Program,
     PresetProgram,
@@ -28,3 +30,14 @@ from .src.main import (
 from .src.prov import BioProvDocument, BioProvDocument
 
 name = "bioprov"
+
+# Module level __getattr__ is only supported from Python 3.7 onwards.
+if sys.version_info < (3, 7):  # no cover
+    from .src.config import config
+
+
+def __getattr__(name):
+    # 'bioprov.config' is created lazily, see bioprov.src.config.get_config() (PEP 562).
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
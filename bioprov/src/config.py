@@ -6,20 +6,41 @@ __version__ = "0.1.24"
 __doc__ = """
 Contains the Config class and other package-level settings.
 
-Define your configurations in the 'config' variable at the end of the module.
+Define your configurations in the Config class. The package level instance is
+returned by get_config() and is also available as 'bioprov.config'.
 """
 
 
+import functools
+import json
 import os
+import sys
+import threading
 from pathlib import Path
 
 from prov.model import Namespace
 from provstore.api import Api
 from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
 
 from bioprov import __file__ as bp_file
 from bioprov.data import data_dir, genomes_dir
-from bioprov.utils import serializer, dict_to_sha256, serializer_filter, create_logger
+from bioprov.utils import (
+    serializer,
+    dict_to_blake2b,
+    serializer_filter,
+    create_logger,
+)
+
+# orjson is optional, it only speeds up reading and writing the database.
+try:
+    import orjson
+except ImportError:  # no cover
+    orjson = None
+
+bioprov_dir = Path(os.path.dirname(bp_file))
+default_db_path = bioprov_dir.joinpath("db.json")
 
 
 class Config:
@@ -40,16 +61,18 @@ class Config:
         if not threads:
             threads = int(os.cpu_count() / 2)
         self.threads = threads
-        self.bioprov_dir = Path(bp_file).parent
+        self.bioprov_dir = bioprov_dir
         self.data = data_dir
         self.genomes = genomes_dir
         if db_path is None:
-            db_path = self.bioprov_dir.joinpath("db.json")
+            db_path = default_db_path
         self._db_path = db_path
-        self._db = BioProvDB(self.db_path)
+        self._db = None
         self._provstore_file = None
         self._provstore_user = None
         self._provstore_token = None
+        self._provstore_loaded = False
+        self._provstore_lock = threading.Lock()
         self._provstore_api = None
         self._provstore_endpoint = "https://openprovenance.org/store/api/v0/"
         self._logger = None
@@ -59,6 +82,9 @@ class Config:
 
     @property
     def db(self):
+        # The database file is only opened and parsed when it is first needed.
+        if self._db is None:
+            self._db = BioProvDB(self.db_path)
         return self._db
 
     @property
@@ -67,7 +93,11 @@ class Config:
 
     @db_path.setter
     def db_path(self, value):
+        # Projects may still hold the old database, so it is not closed here.
+        if self._db is not None:
+            self._db.flush()
         self._db_path = value
+        self._db = None
 
     def db_all(self):
         """
@@ -83,6 +113,14 @@ class Config:
         """
         self.db.clear_db(confirm)  # no cover
 
+    def close(self):
+        """
+        Closes the BioProv database file.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
     @property
     def provstore_api(self):
         if self._provstore_api is None:
@@ -105,11 +143,12 @@ class Config:
     @provstore_file.setter
     def provstore_file(self, value):
         self._provstore_file = value
+        self._provstore_loaded = False
 
     @property
     def provstore_user(self):  # no cover
         if self._provstore_user is None:
-            self.read_provstore_file()
+            self._load_provstore_file()
         return self._provstore_user
 
     @provstore_user.setter
@@ -119,7 +158,7 @@ class Config:
     @property
     def provstore_token(self):  # no cover
         if self._provstore_token is None:
-            self.read_provstore_file()
+            self._load_provstore_file()
         return self._provstore_token
 
     @provstore_token.setter
@@ -148,6 +187,14 @@ class Config:
         print(f"Wrote ProvStore credentials file to {self.provstore_file}.")
         print("Make sure that the contents of that file are private.")
 
+    def _load_provstore_file(self):
+        """
+        Reads self.provstore_file only once, even if called from several threads.
+        """
+        with self._provstore_lock:
+            if not self._provstore_loaded:
+                self.read_provstore_file()
+
     def read_provstore_file(self):
         """
         Attempts to read self.provstore_file.
@@ -171,11 +218,14 @@ class Config:
                 return False
 
         try:
+            # Only the first two lines are needed.
             with open(self.provstore_file) as f:
-                user, token, *_ = f.read().splitlines()
+                user = f.readline().rstrip("\r\n")
+                token = f.readline().rstrip("\r\n")
                 assert all((user, token))
                 self.provstore_user = user
                 self.provstore_token = token
+                self._provstore_loaded = True
                 return
 
         # If not found, prompt to create
@@ -184,6 +234,8 @@ class Config:
                 self.create_provstore_file()
                 self.read_provstore_file()
             else:
+                # Don't prompt again in this session.
+                self._provstore_loaded = True
                 return
 
         # Any other errors, return None and raise Exception
@@ -198,6 +250,7 @@ class Config:
             )
             self.provstore_user = None
             self.provstore_token = None
+            self._provstore_loaded = True
             return
 
     def serializer(self):
@@ -216,13 +269,30 @@ class BioProvDB(TinyDB):
     Class to hold database configuration and methods.
     """
 
-    def __init__(self, path):
-        super().__init__(path)
+    def __init__(self, path, cache_writes=False):
+        """
+        :param path: Path to the database file.
+        :param cache_writes: Whether to keep writes in memory until self.flush() or self.close()
+                             is called, e.g. for many writes in a row. Other instances of the
+                             same file don't see cached writes, so prefer using it as a context
+                             manager: 'with BioProvDB(path, cache_writes=True) as db:'
+        """
+        storage = JSONStorage if orjson is None else ORJSONStorage
+        if cache_writes:
+            storage = CachingMiddleware(storage)
+        super().__init__(path, storage=storage)
         self.db_path = path
 
     def __repr__(self):
         return f"BioProvDB located in {self.db_path}"
 
+    def flush(self):
+        """
+        Writes cached changes to the database file, if writes are cached.
+        """
+        if isinstance(self.storage, CachingMiddleware):
+            self.storage.flush()
+
     def clear_db(self, confirm=False):  # no cover
         """
         Deletes the local BioProv database.
@@ -253,18 +323,71 @@ class BioProvDB(TinyDB):
             proceed = _get_confirm()
         if proceed:
             self.truncate()
+            self.flush()
             print("Erased BioProv database.")
         else:
             print("Canceled operation.")
 
 
+@functools.lru_cache(maxsize=1)
+def _env_to_digest(env_items):
+    """
+    Memoized dict_to_blake2b() of the environment, shared by all Environment instances.
+
+    The environment rarely changes during a session, so it is only hashed again
+    when its items differ from the last call.
+
+    :param env_items: tuple of os.environ items.
+    :return: hexdigest
+    """
+    return dict_to_blake2b(dict(env_items))
+
+
+class ORJSONStorage(JSONStorage):
+    """
+    Inherits from tinydb.storages.JSONStorage
+
+    Reads and writes the database with orjson, which is faster than the json module.
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, access_mode="rb+", **kwargs)
+
+    def read(self):
+        self._handle.seek(0)
+        data = self._handle.read()
+        if not data:
+            return None
+        return orjson.loads(data)
+
+    def write(self, data):
+        try:
+            serialized = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Fall back to the json module for anything orjson can't serialize.
+            serialized = json.dumps(data, **self.kwargs).encode("utf-8")
+        self._handle.seek(0)
+        self._handle.write(serialized)
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._handle.truncate()
+
+
 class Environment:
     """
     Class containing provenance information about the current environment.
     """
 
-    def __init__(self):
+    __slots__ = (
+        "env_hash",
+        "env_hash_long",
+        "env_dict",
+        "user",
+        "env_namespace",
+        "_actedOnBehalfOf",
+    )
 
+    def __init__(self):
         """
         Class constructor. All attributes are empty and are initialized with self.update()
         """
@@ -292,8 +415,11 @@ class Environment:
         Checks current environment and updates attributes using the os.environ module.
         :return: Sets attributes to self.
         """
-        env_dict = dict(os.environ.items())
-        env_hash = dict_to_sha256(env_dict)
+        env_dict = dict(os.environ)
+        # os.environ rarely changes after startup, so usually there is nothing to update.
+        if env_dict == self.env_dict:
+            return
+        env_hash = _env_to_digest(tuple(env_dict.items()))
         if env_hash != self.env_hash_long:
             self.env_dict = env_dict
             self.env_hash = env_hash[:7]
@@ -311,4 +437,29 @@ class Environment:
         return serializer_filter(self, keys)
 
 
-config = Config()
+# The Config instance is only created when it is first used, see get_config().
+_config = None
+
+
+def get_config():
+    """
+    Gets the package level Config instance, creating it on first use.
+
+    :return: bioprov.Config instance.
+    """
+    global _config
+    if _config is None:
+        _config = Config()
+    return _config
+
+
+def __getattr__(name):
+    # Keeps 'from bioprov.src.config import config' working (PEP 562).
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Module level __getattr__ is only supported from Python 3.7 onwards.
+if sys.version_info < (3, 7):  # no cover
+    config = get_config()
@@ -9,10 +9,13 @@ Contains the File and SeqFile classes and related functions.
 
 
 import logging
+import os
+import stat
 from dataclasses import dataclass
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 from Bio import SeqIO, AlignIO
 
 from bioprov.utils import (
@@ -22,44 +25,76 @@ from bioprov.utils import (
     serializer,
     file_to_sha256,
     pattern_replacer,
+    stat_or_none,
 )
 
 
+def _direntry_stat(entry):
+    """
+    :param entry: os.DirEntry yielded by os.scandir().
+    :return: os.stat_result of entry, or None if it cannot be stat'ed, e.g. a dangling symlink.
+    """
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
 class File:
     """
     Class for holding files and file information.
     """
 
+    __slots__ = (
+        "_path_str",
+        "_path",
+        "basename",
+        "name",
+        "extension",
+        "_directory",
+        "tag",
+        "attributes",
+        "_exists",
+        "_size",
+        "_raw_size",
+        "_sha256",
+        "_entity",
+        "_recorded_exists",
+    )
+
     def __init__(self, path, tag=None, attributes=None, _get_hash=True):
         """
-        :param path: A UNIX-like file _path.
+        :param path: A UNIX-like file _path. Must not be a directory, this is asserted
+                     when the file is first stat'ed.
         :param tag: optional tag describing the file.
         :param attributes: Miscellaneous attributes.
         """
-        self.path = Path(path).absolute()
-        assert (
-            not self.path.is_dir()
-        ), f"The path must be to a file, not a directory, you passed:\n'{path}'"
-        self.name = self.path.stem
-        self.basename = self.path.name
-        self.directory = self.path.parent
-        self.extension = self.path.suffix
+        # The path is kept as a string and only converted to a Path when accessed.
+        self._path_str = os.path.abspath(os.fspath(path))
+        self._path = None
+        self.basename = os.path.basename(self._path_str)
+        self.name, self.extension = os.path.splitext(self.basename)
+        self._directory = None
         if tag is None:
             tag = self.name
         if attributes is None:
             attributes = {}
         self.tag = tag
         self.attributes = attributes
-        self._exists = self.path.exists()
-        self.size = get_size(self.path)
-        self._raw_size = get_size(self.path, convert=False)
-        self._sha256 = file_to_sha256(self.path)
+
+        # These are calculated lazily, when they are accessed.
+        self._exists = None
+        self._size = None
+        self._raw_size = None
+        self._sha256 = None
+        # Whether the file existed when it was serialized, see deserialize_files_dict().
+        self._recorded_exists = None
 
         # Provenance attributes
         self._entity = None
 
     def __repr__(self):
-        return str(self.path)
+        return self._path_str
 
     def __str__(self):
         return self.__repr__()
@@ -70,6 +105,27 @@ class File:
     def __radd__(self, other):
         return other + str(self)
 
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = Path(self._path_str)
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        self._path_str = os.fspath(value)
+        self._path, self._directory = None, None
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            self._directory = Path(os.path.dirname(self._path_str))
+        return self._directory
+
+    @directory.setter
+    def directory(self, value):
+        self._directory = value
+
     @property
     def sha256(self):
         self._sha256 = file_to_sha256(self.path)
@@ -81,7 +137,11 @@ class File:
 
     @property
     def exists(self):
-        self._exists = self.path.exists()
+        """
+        Whether the file existed when it was last stat'ed. See File.refresh().
+        """
+        if self._exists is None:
+            self._stat()
         return self._exists
 
     @exists.setter
@@ -90,7 +150,8 @@ class File:
 
     @property
     def size(self):
-        self._size = get_size(self.path)
+        if self._size is None:
+            self._stat()
         return self._size
 
     @size.setter
@@ -99,7 +160,8 @@ class File:
 
     @property
     def raw_size(self):
-        self._raw_size = get_size(self.path, convert=False)
+        if self._raw_size is None:
+            self._stat()
         return self._raw_size
 
     @raw_size.setter
@@ -108,12 +170,53 @@ class File:
 
     @property
     def entity(self):
+        # None until a ProvEntity is assigned, no entity is built for unbound Files.
         return self._entity
 
     @entity.setter
     def entity(self, value):
         self._entity = value
 
+    def refresh(self):
+        """
+        Stats the file once and updates the exists, size and raw_size attributes.
+
+        These attributes are a snapshot of the file at the time it was last stat'ed,
+        so this must be called after the file is created or modified.
+
+        :return: Updates self.
+        """
+        self._sha256 = None
+        self._stat()
+
+    def _stat(self):
+        self._set_stat(stat_or_none(self._path_str))
+
+    def _set_stat(self, stat_result):
+        """
+        :param stat_result: os.stat_result of self.path, or None if it does not exist.
+        :return: Updates the exists, size and raw_size attributes.
+        """
+        if stat_result is None:
+            self._set_st_size(None)
+            return
+        assert not stat.S_ISDIR(
+            stat_result.st_mode
+        ), f"The path must be to a file, not a directory, you passed:\n'{self._path_str}'"
+        self._set_st_size(stat_result.st_size)
+
+    def _set_st_size(self, st_size):
+        """
+        :param st_size: Size of self.path in bytes, or None if it does not exist.
+        :return: Updates the exists, size and raw_size attributes.
+        """
+        if st_size is None:
+            self._exists, self._size, self._raw_size = False, 0, 0
+            return
+        self._exists = True
+        self._raw_size = st_size
+        self._size = get_size(None, st_size=st_size)
+
     def replace_path(self, old_terms, new, warnings=False):
         """
         Replace the current File path.
@@ -127,7 +230,18 @@ class File:
         :return: Updates self.
         """
         old_hash, old_exists = self._sha256, self._exists
-        self.path = Path(pattern_replacer(str(self.path), old_terms, new))
+        if warnings:
+            # Compare with the state recorded in the JSON if the File was loaded from one,
+            # otherwise stat and hash the old path.
+            if self._recorded_exists is not None:
+                old_exists = self._recorded_exists
+            else:
+                old_exists = self.exists
+            if old_hash is None and self.exists:
+                old_hash = self.sha256
+        self.path = pattern_replacer(self._path_str, old_terms, new)
+        self._recorded_exists = None
+        self.refresh()
         if warnings:
             if not self.exists and old_exists:
                 logging.warning(
@@ -138,8 +252,28 @@ class File:
                     f"File {self.path} previous sha256 checksum differs from the current."
                 )
 
-    def serializer(self):
-        return serializer(self)
+    def serializer(self, keys=()):
+        """
+        :param keys: Additional attributes to leave out of the serialized dict.
+        :return: JSON compatible dictionary.
+        """
+        # Calculate lazy attributes so they are included in the output.
+        if self.exists and self._sha256 is None:
+            self._sha256 = file_to_sha256(self.path)
+        serial_out = {"path": self._path_str, "directory": str(self.directory)}
+        serial_out.update(
+            serializer_filter(
+                self,
+                (
+                    "_path_str",
+                    "_path",
+                    "_directory",
+                    "_recorded_exists",
+                )
+                + keys,
+            )
+        )
+        return serial_out
 
 
 class Directory:
@@ -148,13 +282,16 @@ class Directory:
     """
 
     def __init__(self, path, tag=None):
-        self.path = Path(path).absolute()
-        self.name = self.path.stem
-        self.basename = self.path.name
+        path = os.path.abspath(os.fspath(path))
+        self.path = Path(path)
+        self.basename = os.path.basename(path)
+        self.name = os.path.splitext(self.basename)[0]
         if tag is None:
             tag = self.name
         self.tag = tag
         self._exists = self.path.exists()
+        # Whether the directory existed when it was serialized, see deserialize_files_dict().
+        self._recorded_exists = None
 
         # Provenance attributes
         self._entity = None
@@ -172,7 +309,11 @@ class Directory:
         :return: Updates self.
         """
         old_exists = self._exists
+        if self._recorded_exists is not None:
+            old_exists = self._recorded_exists
         self.path = Path(pattern_replacer(str(self.path), old_terms, new))
+        self._recorded_exists = None
+        self.refresh()
         # TODO: replace these print statements for logger warning/debug level
         if warnings:
             if not self.exists and old_exists:
@@ -194,15 +335,25 @@ class Directory:
 
     @property
     def exists(self):
-        self._exists = self.path.exists()
+        """
+        Whether the directory existed when it was last checked. See Directory.refresh().
+        """
         return self._exists
 
     @exists.setter
     def exists(self, value):
         self._exists = value  # no cover
 
+    def refresh(self):
+        """
+        Checks again whether the directory exists.
+
+        :return: Updates self.
+        """
+        self._exists = self.path.exists()
+
     def serializer(self):
-        return serializer(self)
+        return serializer_filter(self, ("_recorded_exists",))
 
     def get_subdirs(self):
         return [i for i in self.path.iterdir() if i.is_dir()]
@@ -235,6 +386,115 @@ class Directory:
             )
 
 
+class FileTable:
+    """
+    Class for holding information about many files at once.
+
+    Attributes are stored as columns of a pandas.DataFrame instead of one File instance
+    per file. File instances are only created when a row is accessed.
+    """
+
+    columns = ("path", "size", "exists", "mtime")
+
+    def __init__(self, paths=None):
+        """
+        :param paths: Iterable of file paths. Each path is stat'ed once.
+                      Paths to directories are left out, as in FileTable.from_directory().
+        """
+        if paths is None:
+            paths = []
+        paths = [os.path.abspath(os.fspath(path)) for path in paths]
+        stat_results = {path: stat_or_none(path) for path in paths}
+        paths = [
+            path
+            for path in paths
+            if stat_results[path] is None
+            or not stat.S_ISDIR(stat_results[path].st_mode)
+        ]
+        self.df = self._build_df(paths, [stat_results[path] for path in paths])
+
+    def __repr__(self):
+        return f"FileTable with {len(self)} files"
+
+    def __len__(self):
+        return len(self.df)
+
+    def __getitem__(self, ix):
+        """
+        :param ix: Row index.
+        :return: File instance with the attributes of the row. The file is not stat'ed again.
+        """
+        path, size, exists, _ = self.df.iloc[ix]
+        file_ = File(path)
+        file_._set_st_size(int(size) if exists else None)
+        return file_
+
+    def __iter__(self):
+        return (self[ix] for ix in range(len(self)))
+
+    @classmethod
+    def from_directory(cls, directory):
+        """
+        Creates a FileTable from the files in a directory, listing it once with os.scandir().
+
+        :param directory: Path to a directory.
+        :return: FileTable instance.
+        """
+        with os.scandir(directory) as it:
+            entries = [entry for entry in it if entry.is_file()]
+        table = cls()
+        table.df = cls._build_df(
+            [os.path.abspath(entry.path) for entry in entries],
+            [_direntry_stat(entry) for entry in entries],
+        )
+        return table
+
+    @classmethod
+    def _build_df(cls, paths, stat_results):
+        """
+        :param paths: List of absolute paths.
+        :param stat_results: List of os.stat_result or None for each path, if it was not found.
+        :return: pandas.DataFrame with one row per path.
+        """
+        return pd.DataFrame(
+            {
+                "path": pd.Series(paths, dtype=object),
+                "size": np.array(
+                    [0 if st is None else st.st_size for st in stat_results],
+                    dtype=np.int64,
+                ),
+                "exists": np.array([st is not None for st in stat_results], dtype=bool),
+                "mtime": np.array(
+                    [0 if st is None else st.st_mtime_ns for st in stat_results],
+                    dtype=np.int64,
+                ),
+            },
+            columns=cls.columns,
+        )
+
+    @property
+    def paths(self):
+        return self.df["path"]
+
+    @property
+    def sizes(self):
+        return self.df["size"]
+
+    @property
+    def exists(self):
+        return self.df["exists"]
+
+    @property
+    def mtimes(self):
+        return self.df["mtime"]
+
+    def to_files(self):
+        """
+        :return: List of File instances, one for each row.
+        """
+        return list(self)
+
+
 class SeqFile(File):
     """
     Class for holding sequence file and sequence information. Inherits from File.
@@ -302,9 +562,10 @@ class SeqFile(File):
         self._max_seq = None
         self._min_seq = None
 
-        if self.exists:
-            self._seqrecordgenerator()
-        else:
+        # The generator is created lazily by self.generator, so the file is only
+        # stat'ed here if records or stats are requested. This keeps SeqFiles of
+        # files that don't exist yet (e.g. program outputs) cheap to create.
+        if (import_records or calculate_seqstats) and not self.exists:
             import_records = False
             calculate_seqstats = False
 
@@ -355,7 +616,7 @@ class SeqFile(File):
 
     def serializer(self):
         keys = ("records",)
-        return serializer_filter(self, keys)
+        return super().serializer(keys)
 
     def _calculate_seqstats(
         self,
@@ -541,6 +802,12 @@ def seqrecordgenerator(path, format, parser="seq", warnings=False):
         return None
 
 
+# Stat attributes are recorded when the JSON is written, so they are not loaded.
+# They are calculated again when accessed. Whether the file existed is kept in
+# _recorded_exists, for the warnings of replace_path().
+_stat_attributes = ("_exists", "_size", "_raw_size")
+
+
 def deserialize_files_dict(files_dict):
     """
     Deserialize a dictionary of files in JSON format.
@@ -564,12 +831,15 @@ def deserialize_files_dict(files_dict):
                                 file[seqstats_attr_],
                             )
             else:
-                if file["path"].endswith("/"):
+                # Serialized Directories have no 'directory' key, unlike Files.
+                if file["path"].endswith("/") or "directory" not in file.keys():
                     files_dict[tag] = Directory(file["path"], tag=file["tag"])
                 else:
                     files_dict[tag] = File(file["path"], tag=file["tag"])
+            if "_exists" in file.keys():
+                files_dict[tag]._recorded_exists = file["_exists"]
             for attr_, value_ in file.items():
-                if attr_ not in ("path",):
+                if attr_ not in ("path",) + _stat_attributes:
                     try:
                         setattr(files_dict[tag], attr_, value_)
                         if attr_ == "_generator":
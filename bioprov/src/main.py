@@ -39,9 +39,13 @@ from coolname import generate_slug
 from prov.model import ProvEntity, ProvBundle, Namespace
 from tinydb import Query
 
-from bioprov import config
-from bioprov.src.config import Environment, BioProvDB
-from bioprov.src.files import File, SeqFile, Directory, deserialize_files_dict
+from bioprov.src.config import Environment, BioProvDB, get_config
+from bioprov.src.files import (
+    File,
+    SeqFile,
+    Directory,
+    deserialize_files_dict,
+)
 from bioprov.utils import (
     Warnings,
     serializer,
@@ -199,7 +203,7 @@ class Program:
         k, v = parameter.key, parameter.value
         self.params[k] = parameter
         self.param_str = generate_param_str(self.params)
-        config.logger.debug(
+        get_config().logger.debug(
             f"Added parameter {k} with value '{v}' to program {self.name}"
         )  # no cover
         if _generate_cmd:
@@ -386,6 +390,7 @@ class Run:
         self.status = self._finished_to_status(self.finished)
 
         # User who ran the task
+        config = get_config()
         self.user = config.user
         self.env = config.env.env_hash
 
@@ -455,7 +460,7 @@ class Run:
         str_ = str_.strip()
         if str_.endswith("\\"):
             str_ = str_[:-1]
-        config.logger.info(str_)
+        get_config().logger.info(str_)
 
         p = Popen(self.program.cmd, shell=True, stdout=PIPE, stderr=PIPE)
         self.process = p
@@ -478,9 +483,15 @@ class Run:
         self.finished = True
         self._status = self._finished_to_status(self.finished)
 
+        # Output files are only created now, so update their stat snapshots.
+        if self.sample is not None:
+            for file_ in self.sample.files.values():
+                if isinstance(file_, (File, Directory)):
+                    file_.refresh()
+
         if not self.auto_suppress_stdout:
-            config.logger.debug(self.stdout)  # no cover
-        config.logger.debug(self.stderr)  # no cover
+            get_config().logger.debug(self.stdout)  # no cover
+        get_config().logger.debug(self.stderr)  # no cover
 
         return self
 
@@ -704,7 +715,9 @@ class PresetProgram(Program):
                 try:
                     parameter.value = str(self.sample.files[f"{parameter.tag}"])
                 except AttributeError:
-                    config.logger.warning("Warning: no sample associated with program.")
+                    get_config().logger.warning(
+                        "Warning: no sample associated with program."
+                    )
                     pass  # Suppress bug for now.
             else:
                 pass
@@ -781,7 +794,7 @@ def generate_param_str(params):
         param_str = str_.strip()
     else:
         # TODO: add more parameters options. List of tuples, List of Parameter instances, etc.
-        config.logger.error(
+        get_config().logger.error(
             "Must provide either a string or a dictionary for the parameters!"
         )
         raise TypeError
@@ -1052,7 +1065,7 @@ def _run_programs(_object):
             # noinspection PyProtectedMember
             _object._run_program(p)
     else:
-        config.logger.warning(f"No programs to run for {_object}")
+        get_config().logger.warning(f"No programs to run for {_object}")
 
 
 class Project:
@@ -1080,7 +1093,7 @@ class Project:
         """
         if tag is None:
             slug = generate_slug(2)
-            config.logger.warning(
+            get_config().logger.warning(
                 f"No Project tag was set. Generated random tag: '{slug}'."
             )
             tag = slug
@@ -1096,6 +1109,7 @@ class Project:
 
         # environments are stored based on the user name
         # avoid duplicated user names!
+        config = get_config()
         self.users = {config.user: {config.env.env_hash: config.env}}
 
         # PROV attributes
@@ -1108,7 +1122,7 @@ class Project:
         self._sha256 = dict_to_sha256(self.serializer())
         self.auto_update = auto_update
         if db is None:
-            db = config.db
+            db = get_config().db
         self.db = db
 
         # Log attributes
@@ -1130,7 +1144,7 @@ class Project:
                 value = self._samples[item]
                 return value
             except KeyError:
-                config.logger.error(
+                get_config().logger.error(
                     f"Sample {item} not in Project.\n" f"Check the following keys:" " ",
                     "\n  ".join(list(self.keys)),
                 )
@@ -1205,7 +1219,9 @@ class Project:
         if result:
             db.update(self.serializer(), query.tag == self.tag)
         else:
-            config.logger.info(f"Inserting new project '{self.tag}' in {db.db_path}")
+            get_config().logger.info(
+                f"Inserting new project '{self.tag}' in {db.db_path}"
+            )
             db.insert(self.serializer())
 
     def auto_update_db(self):
@@ -1223,6 +1239,7 @@ class Project:
         return result, query
 
     def _update_envs(self):
+        config = get_config()
         if config.env.env_hash not in self.users.values():
             self.users[config.user][config.env.env_hash] = {
                 config.env.env_hash: config.env
@@ -1261,7 +1278,9 @@ class Project:
         if log_file is None:
             log_file = f"{self.tag}.log"
         self.log_file = log_file
-        self.logger = config.logger = create_logger(level, self.log_file, self.tag)
+        self.logger = get_config().logger = create_logger(
+            level, self.log_file, self.tag
+        )
         if _custom_start_message is None:
             _custom_start_message = f"Starting log for project '{self.tag}'."
 
@@ -1320,7 +1339,7 @@ class Project:
         if sample.name is None:
             slug = generate_slug(2)
             sample.name = slug
-            config.logger.warning(
+            get_config().logger.warning(
                 f"No sample name set. Setting random name: {sample.name}"
             )
 
@@ -1466,7 +1485,7 @@ def _add_files(object_, files):
     # Here 'files' must be a dictionary of File or Directory instances
     for k, v in files.items():
         if k in object_.files.keys():
-            config.logger.info(f"Updating file {k} with value {v}.")
+            get_config().logger.info(f"Updating file {k} with value {v}.")
         object_.files[k] = v
 
     object_.auto_update_db()
@@ -1484,7 +1503,8 @@ def to_json(object_, dictionary, _path=None):
     if "json" not in object_.files.keys():
         object_.add_files({"json": _path})
 
-    return write_json(dictionary, _path)
+    write_json(dictionary, _path)
+    object_.files["json"].refresh()
 
 
 def from_json(json_file, kind="Project", replace_path=None, replace_home=False):
@@ -1580,7 +1600,7 @@ def from_json(json_file, kind="Project", replace_path=None, replace_home=False):
             project.replace_paths(other_HOME_variables, HOME, warnings=True)
 
         if replace_path:
-            config.logger.info(
+            get_config().logger.info(
                 "Replacing paths:"
                 f"\tOld:\t{replace_path[0][0]}"
                 f"\tNew:\t{replace_path[1]}"
@@ -1738,9 +1758,9 @@ def write_json(dict_, _path):
         json.dump(dict_, f, indent=3)
 
     if Path(_path).exists():
-        config.logger.info(f"Created JSON file at {_path}.")
+        get_config().logger.info(f"Created JSON file at {_path}.")
     else:
-        config.logger.info(f"Could not create JSON file for {_path}.")
+        get_config().logger.info(f"Could not create JSON file for {_path}.")
 
 
 def load_project(tag, db=None, import_records=False):
@@ -1752,21 +1772,27 @@ def load_project(tag, db=None, import_records=False):
     :param import_records: Whether to import the sequence records. Unnecessary if this data is already recorded in the Project.
     :return: Instance of Project.
     """
+    # A database opened from a path is closed once the project is read.
+    close_db = db is not None
     if db is None:
-        db = config.db
+        db = get_config().db
 
     else:
         assert Path(db).exists(), Warnings()["not_exist"](db)
         db = BioProvDB(path=db)
 
-    assert len(db) > 0, f"Project not found. Database at '{db.db_path}' is empty"
-
-    query = Query()
     try:
-        result = db.search(query.tag == tag)[0]
-    except (IndexError, KeyError):
-        config.logger.error(f"Project not found in database at {db.db_path}")
-        return
+        assert len(db) > 0, f"Project not found. Database at '{db.db_path}' is empty"
+
+        query = Query()
+        try:
+            result = db.search(query.tag == tag)[0]
+        except (IndexError, KeyError):
+            get_config().logger.error(f"Project not found in database at {db.db_path}")
+            return
+    finally:
+        if close_db:
+            db.close()
 
     with tempfile.NamedTemporaryFile() as f:
         f.write(bytes(json.dumps(result), "utf-8"))
@@ -17,7 +17,8 @@ from prov.dot import prov_to_dot
 from prov.model import ProvDocument
 from requests.exceptions import ConnectionError
 
-from bioprov import Project, Parameter, config
+from bioprov import Project, Parameter
+from bioprov.src.config import get_config
 from bioprov.utils import Warnings, build_prov_attributes, serializer_filter
 
 
@@ -179,7 +180,7 @@ class BioProvDocument:
                 try:
                     statement
                 except KeyError:
-                    config.logger.debug(
+                    get_config().logger.debug(
                         f"Could not run function '{statement.__name__}' for sample {sample.name}."
                     )
                     pass
@@ -394,7 +395,7 @@ class BioProvDocument:
         :return: Sends POST request to ProvStore API and updates self.ProvDocument if successful.
         """
         if api is None:
-            api = config.provstore_api
+            api = get_config().provstore_api
         try:
             self.provstore_document = api.document.create(
                 self.ProvDocument, name=self.project.tag
@@ -17,7 +17,8 @@ from os import path
 import pandas as pd
 from tqdm import tqdm
 
-from bioprov import from_df, config, PresetProgram, BioProvDocument, File
+from bioprov import from_df, PresetProgram, BioProvDocument, File
+from bioprov.src.config import get_config
 from bioprov.utils import Warnings, create_logger
 
 
@@ -163,8 +164,8 @@ class Workflow:
     def _post_wf_actions(self):
         self.create_provenance()
         if self.update_db:
-            config.logger.info(
-                f"Updating project '{self.project.tag}' at {config.db_path}"
+            get_config().logger.info(
+                f"Updating project '{self.project.tag}' at {get_config().db_path}"
             )
             self._update_db()
         if self.upload_to_provstore:
@@ -214,7 +215,7 @@ class Workflow:
             "-c",
             "--cpus",
             help="Default is set in BioProv config (half of the CPUs).",
-            default=config.threads,
+            default=get_config().threads,
         )
         parser.add_argument(
             "-v",
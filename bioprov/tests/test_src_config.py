@@ -16,7 +16,7 @@ from coolname import generate_slug
 from tinydb import TinyDB, Query
 
 import bioprov as bp
-from bioprov.src.config import Config, BioProvDB
+from bioprov.src.config import Config, BioProvDB, get_config
 
 
 def test_Config():
@@ -30,7 +30,16 @@ def test_Config():
     assert config.genomes.exists()
     assert config.data.exists()
     assert str(config) == f"BioProv Config class set in {bp.src.config.__file__}"
+    assert config._db is None, "Database should only be opened when accessed."
     assert type(len(config.db_all())) == int
+    with NamedTemporaryFile(suffix=".json") as f:
+        config.db_path = f.name
+        config.db.insert({"user": config.user})
+        old_db = config.db
+        config.db_path = config.bioprov_dir.joinpath("db.json")
+        assert len(TinyDB(f.name)) == 1, "Database was not written with the old path."
+        old_db.insert({"user": config.user})
+        assert len(TinyDB(f.name)) == 2, "Old database should still be usable."
 
     # ProvStore properties
     # getters
@@ -50,6 +59,19 @@ def test_Config():
         config.provstore_file = f.name
         config.create_provstore_file(user=generate_slug(2), token=generate_slug(4))
         config.read_provstore_file()
+        assert config._provstore_loaded
+        assert config.provstore_user is not None
+        assert config.provstore_token is not None
+
+
+def test_get_config():
+    """
+    Testing for the lazily created package level Config instance.
+    :return:
+    """
+    config = get_config()
+    assert isinstance(config, Config)
+    assert config is get_config() is bp.config is bp.src.config.config
 
 
 def test_BioProvDB():
@@ -72,6 +94,25 @@ def test_BioProvDB():
     # Create and erase database
     non_db_path = "./." + generate_slug(4) + ".json"
     non_db = BioProvDB(non_db_path)
+    non_db.insert({slug: slug_})
+    with BioProvDB(non_db_path, cache_writes=True) as cached_db:
+        cached_db.insert({slug_: slug})
+        assert len(TinyDB(non_db_path)) == 1, "Writes should be cached."
+        cached_db.flush()
+        assert len(TinyDB(non_db_path)) == 2, "Cached writes were not flushed to disk."
+        cached_db.insert({slug_: slug_})
+    assert len(TinyDB(non_db_path)) == 3, "Cached writes were not written on close."
+
+    # Instances of the same file don't overwrite each other's writes
+    db_1, db_2 = BioProvDB(non_db_path), BioProvDB(non_db_path)
+    assert len(db_1) == len(db_2) == 3
+    db_2.insert({slug: slug})
+    db_1.insert({slug_: slug_})
+    assert len(TinyDB(non_db_path)) == 5
+
+    # Non-string keys are converted to strings, as with the json module
+    db_1.insert({slug: {1: slug_}})
+    assert TinyDB(non_db_path).all()[-1] == {slug: {"1": slug_}}
     non_db.clear_db(confirm=True)
     assert len(non_db) == 0, f"Did not correctly erase the database at {non_db_path}"
     remove(non_db_path)
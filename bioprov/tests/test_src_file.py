@@ -10,13 +10,17 @@ Testing for the File module.
 
 from pathlib import Path
 
+import pytest
 from coolname import generate_slug
 from prov.model import ProvEntity
 
 import bioprov as bp
-from bioprov import File, SeqFile, Directory, utils
-from bioprov.data import synechococcus_genome
-from bioprov.src.files import seqrecordgenerator
+from bioprov import File, SeqFile, Directory, FileTable, utils
+from bioprov.data import synechococcus_genome, genomes_dir
+from bioprov.src.files import (
+    seqrecordgenerator,
+    deserialize_files_dict,
+)
 
 
 def test_File_and_Directory():
@@ -35,6 +39,8 @@ def test_File_and_Directory():
     d = Directory(f.path.parent)
     non_existing = generate_slug(2)
     nf = File("./" + non_existing)
+    # A path under a file raises NotADirectoryError when stat'ed
+    under_file = file + "/" + non_existing
     attributes = {
         # File class - existing file
         "path": f.path == Path(file).absolute(),
@@ -49,10 +55,13 @@ def test_File_and_Directory():
         "non_existing": nf.exists is False,
         "no_size": nf.size == 0,
         "nf_repr": nf.__repr__() == str(nf.path),
+        "under_file": File(under_file).exists is False,
+        "under_file_size": utils.get_size(under_file) == 0,
         # get_size() function
         "get_size": f.size == utils.get_size(f.path),
         "raw_get_size": f.raw_size
         == utils.get_size(f.path, convert=False),  # get_size(convert=False)
+        "st_size_get_size": utils.get_size(None, st_size=2 ** 10) == "1.0 KB",
         # Convert bytes function
         "convert_bytes": utils.convert_bytes(2 ** 10) == "1.0 KB",
     }
@@ -68,6 +77,45 @@ def test_File_and_Directory():
     _ = f.entity
     f.entity = ProvEntity(None, generate_slug(2))
 
+    # Directories are rejected when the File is first stat'ed
+    dir_file = File(f.path.parent)
+    with pytest.raises(AssertionError):
+        _ = dir_file.exists
+
+    # Stat attributes recorded in JSON are not loaded
+    serialized = File(non_existing).serializer()
+    serialized.update({"_exists": True, "_size": "1.0 KB", "_raw_size": 2 ** 10})
+    loaded = deserialize_files_dict({"nf": serialized})["nf"]
+    assert loaded.exists is False and loaded.raw_size == 0
+    serialized = d.serializer()
+    serialized["_exists"] = False
+    loaded = deserialize_files_dict({"d": serialized})["d"]
+    assert isinstance(loaded, Directory) and loaded.exists is True
+
+
+def test_replace_path_warnings(caplog):
+    """
+    Tests the File.replace_path() warnings for files that were never hashed.
+    :return:
+    """
+    old, new = Path("./" + generate_slug(2)), Path("./" + generate_slug(2))
+    old.write_text(generate_slug(2))
+    new.write_text(generate_slug(2))
+    File(old).replace_path((old.name,), new.name, warnings=True)
+    assert "sha256 checksum differs" in caplog.text
+    new.unlink()
+    File(old).replace_path((old.name,), new.name, warnings=True)
+    assert "was not found" in caplog.text
+    old.unlink()
+
+    # Files loaded from JSON are compared with the recorded state
+    caplog.clear()
+    serialized = File(old).serializer()
+    serialized["_exists"] = True
+    loaded = deserialize_files_dict({"old": serialized})["old"]
+    loaded.replace_path((old.name,), new.name, warnings=True)
+    assert "was not found" in caplog.text
+
 
 def test_SeqFile():
     """
@@ -78,6 +126,7 @@ def test_SeqFile():
     genome = SeqFile(synechococcus_genome, tag, import_records=True)
     nf_genome, nf_tag = generate_slug(2), generate_slug(2)
     nf_genome = SeqFile(nf_genome, nf_tag)
+    assert nf_genome._exists is None, "SeqFile should not stat the file unless needed."
 
     # Instance where file exists
     existing_instance = {
@@ -112,3 +161,50 @@ def test_SeqFile():
     # Test FileNotFound warning
     none = seqrecordgenerator(nf_genome.path, "fasta", warnings=True)
     assert none is None, f"{none} should be a NoneType object!"
+
+
+def test_refresh():
+    """
+    Tests that File attributes are a snapshot until File.refresh() is called.
+    :return:
+    """
+    path = Path("./" + generate_slug(2))
+    nf = File(path)
+    assert nf.exists is False
+    path.write_text(generate_slug(2))
+    assert File(path).exists is True
+    assert nf.exists is False
+    nf.refresh()
+    assert nf.exists is True and nf.raw_size > 0
+    path.unlink()
+
+
+def test_FileTable(monkeypatch):
+    """
+    Tests the FileTable class.
+    :return:
+    """
+    table = FileTable.from_directory(genomes_dir)
+    assert len(table) > 0 and table.exists.all()
+
+    # Rows are turned into Files without stat'ing them again
+    with monkeypatch.context() as m:
+        m.setattr("os.stat", None)
+        assert all(f.exists and f.size for f in table.to_files())
+    file = table[0]
+    assert isinstance(file, File) and file.exists
+    assert file.raw_size == Path(file.path).stat().st_size == table.sizes[0]
+
+    non_existing = "./" + generate_slug(2)
+    table = FileTable([synechococcus_genome, non_existing])
+    assert table.exists.tolist() == [True, False]
+    assert len(table.df[table.exists & (table.sizes > 0)]) == 1
+    assert [f.exists for f in table.to_files()] == [True, False]
+
+    # Directories are left out and dangling symlinks don't exist
+    dangling = Path("./" + generate_slug(2))
+    dangling.symlink_to(generate_slug(2))
+    table = FileTable([dangling, genomes_dir, synechococcus_genome])
+    assert table.exists.tolist() == [False, True]
+    assert table[0].exists is False and table[0].raw_size == 0
+    dangling.unlink()
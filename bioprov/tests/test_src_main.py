@@ -31,6 +31,7 @@ from bioprov import (
     read_csv,
     write_json,
     from_json,
+    load_project,
     BioProvDocument,
     BioProvDB,
 )
@@ -245,6 +246,13 @@ def test_Project():
     assert type(ss.to_df()) == pd.DataFrame
     assert len(ss) == 1
 
+    # Loading from another BioProvDB instance of the same file
+    db_path = "./." + generate_slug(4) + ".json"
+    project = Project(tag=generate_slug(2))
+    project.update_db(BioProvDB(db_path))
+    assert load_project(project.tag, db=db_path).tag == project.tag
+    remove(db_path)
+
 
 def test_from_df():
     """
@@ -17,7 +17,7 @@ from bioprov import read_csv
 from bioprov.data import picocyano_dataset
 from bioprov.src.config import Environment
 from bioprov.src.prov import BioProvDocument
-from bioprov.utils import dict_to_sha256
+from bioprov.utils import dict_to_blake2b
 
 project = read_csv(
     picocyano_dataset, sequencefile_cols="assembly", tag="picocyanobacteria"
@@ -30,7 +30,7 @@ def test_EnvProv():
     :return:
     """
     env = Environment()
-    sh = dict_to_sha256(env.env_dict)
+    sh = dict_to_blake2b(env.env_dict)
     for statement in (
         env.env_dict == dict(environ.items()),
         env.env_hash_long == sh,
@@ -38,6 +38,15 @@ def test_EnvProv():
     ):
         assert statement
 
+    # Environment variables with undecodable bytes, e.g. BADVAR=$'\xff'
+    environ["BIOPROV_BADVAR"] = "\udcff"
+    try:
+        env = Environment()
+        assert env.env_hash_long == dict_to_blake2b(dict(environ.items()))
+        assert env.env_hash_long != sh
+    finally:
+        del environ["BIOPROV_BADVAR"]
+
 
 def test_BioProvDocument():
     """
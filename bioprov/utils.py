@@ -7,10 +7,12 @@ __doc__ = """
 Helper functions.
 """
 
+import errno
 import hashlib
 import io
 import json
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -30,22 +32,45 @@ def convert_bytes(num):
         num /= 1024.0
 
 
-def get_size(path, convert=True):
+# The same errors that pathlib.Path.exists() treats as a missing path.
+_missing_path_errnos = (errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP)
+_missing_path_winerrors = (21, 123, 1921)
+
+
+def stat_or_none(path):
     """
-    Calculate size of a given file.
+    Stats a path, returning None if it does not exist.
     :param path: Valid _path of a file.
+    :return: os.stat_result or None if the path does not exist.
+    """
+    try:
+        return os.stat(path)
+    except OSError as e:
+        if (
+            e.errno in _missing_path_errnos
+            or getattr(e, "winerror", None) in _missing_path_winerrors
+        ):
+            return None
+        raise
+
+
+def get_size(path, convert=True, st_size=None):
+    """
+    Calculate size of a given file.
+    :param path: Valid _path of a file. Not used if st_size is passed.
     :param convert: Whether to convert the values to bytes, KB, etc.
+    :param st_size: Optional size of path in bytes. If passed, the file is not stat'ed again.
     :return: Size with converted values. 0 if file does not exist.
     """
-    path = Path(path)
-    if path.exists():
-        size = path.stat().st_size
-        if convert:
-            return convert_bytes(size)
-        else:
-            return size
+    if st_size is None:
+        stat_result = stat_or_none(path)
+        if stat_result is None:
+            return 0
+        st_size = stat_result.st_size
+    if convert:
+        return convert_bytes(st_size)
     else:
-        return 0
+        return st_size
 
 
 def file_to_sha256(path):
@@ -127,7 +152,7 @@ def serializer(object_):
     if isinstance(object_, dict):
         pass
     else:
-        object_ = object_.__dict__.copy()
+        object_ = get_attributes(object_)
 
     for k, v in object_.items():
         # Checks for serializer method
@@ -146,6 +171,21 @@ def serializer(object_):
     return serial_out
 
 
+def get_attributes(object_):
+    """
+    Gets the instance attributes of an object, including the ones declared in __slots__.
+    :param object_: Any object.
+    :return: dict of attribute names and values, a copy of object_.__dict__ if it has no slots.
+    """
+    attributes = dict()
+    for class_ in reversed(type(object_).__mro__):
+        for slot in getattr(class_, "__slots__", ()):
+            if hasattr(object_, slot):
+                attributes[slot] = getattr(object_, slot)
+    attributes.update(getattr(object_, "__dict__", {}))
+    return attributes
+
+
 def has_serializer(object_):
     _has_serializer = getattr(object_, "serializer", None)
     return callable(_has_serializer)
@@ -198,13 +238,13 @@ def dict_to_string(dictionary):
 
 def serializer_filter(_object, keys):
     """
-    Filters keys from _object.__dict__ to make custom serializers.
+    Filters keys from the attributes of _object to make custom serializers.
 
     :param _object: A bioprov object
     :param keys: keys to be filtered.
     :return: dict
     """
-    serial_out = _object.__dict__.copy()
+    serial_out = get_attributes(_object)
 
     for key in keys:
         if key in serial_out.keys():
@@ -224,6 +264,24 @@ def dict_to_sha256(dictionary):
     return digest
 
 
+def dict_to_blake2b(dictionary, digest_size=8):
+    """
+    Get a short blake2b hexdigest from a dictionary.
+
+    Faster than dict_to_sha256 and meant for fingerprints, not for security.
+    Items are sorted and joined into a single buffer, so dictionaries with the same
+    items have the same digest. Values are converted with str(), and undecodable
+    bytes (e.g. in os.environ) are kept with the 'surrogateescape' error handler.
+    :param dictionary: dict
+    :param digest_size: Size of the digest in bytes.
+    :return: hexdigest
+    """
+    payload = "\x1f".join(f"{k}={v}" for k, v in sorted(dictionary.items()))
+    return hashlib.blake2b(
+        payload.encode("utf-8", "surrogateescape"), digest_size=digest_size
+    ).hexdigest()
+
+
 def pattern_replacer(pattern, iterable_of_olds, new):
     """
     Replaces a list of old terms from a given pattern for a new term.